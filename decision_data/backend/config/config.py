@@ -1,5 +1,6 @@
 """ Config parameters in pydantic settings format """
 
+from botocore.config import Config
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -39,6 +40,9 @@ class BackendConfig(BaseSettings):
     PHONE_NUMBER: str = ""
     GMAIL_ACCOUNT: str = ""
 
+    # Email sending rate, in messages per second
+    EMAIL_MAX_SEND_RATE: float = 10.0
+
     # Daily summary time
     DAILY_SUMMARY_HOUR: int = 17
     TIME_OFFSET_FROM_UTC: int = -6
@@ -53,3 +57,13 @@ class BackendConfig(BaseSettings):
 
 
 backend_config = BackendConfig()
+
+# botocore settings shared by every boto3 client: keep connections alive for
+# reuse, retry with adaptive backoff when throttled, and bound tail latency.
+boto_config = Config(
+    max_pool_connections=64,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
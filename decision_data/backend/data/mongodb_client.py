@@ -1,9 +1,9 @@
 # decision_data/backend/data/mongodb_client.py
 
-from pymongo import MongoClient
+from pymongo import InsertOne, MongoClient
 from loguru import logger
 import pymongo
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from decision_data.backend.utils.logger import setup_logger
 
 setup_logger()
@@ -103,12 +103,45 @@ class MongoDBClient:
         else:
             logger.info("No stories to insert.")
 
+    def ensure_indexes(self) -> None:
+        """
+        Create the index that date-range reads filter and sort on.
+
+        Call once at setup rather than on the read path. A missing index only
+        makes reads slower, so a user without index privileges gets a
+        warning instead of an error.
+        """
+        try:
+            self.collection.create_index([("created_utc", pymongo.ASCENDING)])
+        except pymongo.errors.OperationFailure as e:
+            logger.warning(f"Could not create the created_utc index: {e}")
+
+    def _find_between_dates(
+        self,
+        date_field: str,
+        start_date_str: str,
+        end_date_str: str,
+        min_transcript_length: int,
+        projection: Optional[Dict[str, Any]],
+    ) -> pymongo.cursor.Cursor:
+        logger.debug(f"Filtering data between {start_date_str} and {end_date_str}")
+
+        query = {
+            "created_utc": {
+                "$gte": start_date_str,
+                "$lte": end_date_str,
+            },
+            "transcript": {"$regex": f".{{{min_transcript_length},}}"},
+        }
+        return self.collection.find(query, projection=projection).sort(date_field, 1)
+
     def get_records_between_dates(
         self,
         date_field: str,
         start_date_str: str,
         end_date_str: str,
         min_transcript_length: int = 4,
+        projection: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve records from the collection where 'created_utc' is between
@@ -116,20 +149,48 @@ class MongoDBClient:
 
         :param start_date_str: Start date string in the format 'YYYY-MM-DDTHH:MM:SSZ'
         :param end_date_str: End date string in the format 'YYYY-MM-DDTHH:MM:SSZ'
+        :param projection: fields to return, defaults to the whole document
         :return: List of records
         """
+        return list(
+            self._find_between_dates(
+                date_field=date_field,
+                start_date_str=start_date_str,
+                end_date_str=end_date_str,
+                min_transcript_length=min_transcript_length,
+                projection=projection,
+            )
+        )
+
+    def iter_records_between_dates(
+        self,
+        date_field: str,
+        start_date_str: str,
+        end_date_str: str,
+        min_transcript_length: int = 4,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the same records as get_records_between_dates.
 
-        logger.debug(f"Filtering data between {start_date_str} and {end_date_str}")
+        Records are fetched from the server ``batch_size`` at a time as the
+        caller iterates, so only one batch is held in memory. The client
+        must stay open until iteration is finished.
 
-        query = {
-            "created_utc": {
-                "$gte": start_date_str,
-                "$lte": end_date_str,
-            },
-            "transcript": {"$regex": f".{{{min_transcript_length},}}"},
-        }
-        result = list(self.collection.find(query).sort(date_field, 1))
-        return result
+        :param start_date_str: Start date string in the format 'YYYY-MM-DDTHH:MM:SSZ'
+        :param end_date_str: End date string in the format 'YYYY-MM-DDTHH:MM:SSZ'
+        :param projection: fields to return, defaults to the whole document
+        :param batch_size: number of records per round-trip, defaults to 100
+        :return: iterator over records
+        """
+        yield from self._find_between_dates(
+            date_field=date_field,
+            start_date_str=start_date_str,
+            end_date_str=end_date_str,
+            min_transcript_length=min_transcript_length,
+            projection=projection,
+        ).batch_size(batch_size)
 
     def close(self) -> None:
         """
@@ -160,3 +221,23 @@ class MongoDBClient:
                 logger.error(f"Error inserting stories into MongoDB: {e}")
         else:
             logger.info("No stories to insert.")
+
+    def insert_daily_summaries(self, summaries: List[Dict[str, Any]]) -> None:
+        """insert several daily summaries in one bulk write
+
+        :param summaries: summary data in dictionary format, one per day
+        :type summaries: List[Dict[str, Any]]
+        """
+
+        if summaries:
+            try:
+                self.collection.bulk_write(
+                    [InsertOne(summary) for summary in summaries], ordered=False
+                )
+                logger.info(f"Inserted {len(summaries)} daily summaries into MongoDB.")
+            except pymongo.errors.BulkWriteError as e:
+                logger.warning(f"Some daily summaries were not inserted: {e.details}")
+            except Exception as e:
+                logger.error(f"Error inserting daily summaries into MongoDB: {e}")
+        else:
+            logger.info("No daily summaries to insert.")
@@ -49,7 +49,7 @@ def automation_controler():
                 year=str(current_utc_time.year),
                 month=str(current_utc_time.month),
                 day=str(current_utc_time.day),
-                prompt_path=prompt_path,
+                prompt=prompt_path,
             )
             sent_daily = True
 
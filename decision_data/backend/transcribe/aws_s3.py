@@ -1,18 +1,26 @@
 """ Manipulations for aws s3 buckets """
 
 import boto3
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from typing import List
 from loguru import logger
 from mypy_boto3_s3 import S3Client
-from decision_data.backend.config.config import backend_config
+from decision_data.backend.config.config import backend_config, boto_config
 from botocore.exceptions import BotoCoreError, ClientError
 from decision_data.backend.utils.logger import setup_logger
 
 setup_logger()
 
 
+@lru_cache(maxsize=1)
 def get_s3_client() -> S3Client:
-    """Get a s3 client
+    """Get the shared s3 client
+
+    The client is built once per process and reused, so downloads, uploads
+    and deletes share its credentials and connection pool instead of paying
+    for a new client on every call.
 
     :return: s3 client seesion
     :rtype: Session
@@ -22,6 +30,7 @@ def get_s3_client() -> S3Client:
         aws_access_key_id=backend_config.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=backend_config.AWS_SECRET_ACCESS_KEY,
         region_name=backend_config.REGION_NAME,
+        config=boto_config,
     )
     return s3_client
 
@@ -137,17 +146,18 @@ def list_s3_files(
     """
     # Initialize S3 client
     s3_client = get_s3_client()
-    file_keys = []
+    file_keys: List[str] = []
+    extend_keys = file_keys.extend
 
     try:
         paginator = s3_client.get_paginator("list_objects_v2")
         for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
-            if "Contents" in page:
-                for obj in page["Contents"]:
-                    key = obj["Key"]
-                    # Exclude the prefix itself and any 'folder' keys
-                    if key != prefix and not key.endswith("/"):
-                        file_keys.append(key)
+            # Exclude the prefix itself and any 'folder' keys
+            extend_keys(
+                key
+                for key in map(itemgetter("Key"), page.get("Contents", ()))
+                if key != prefix and not key.endswith("/")
+            )
         logger.info(
             f"Listed {len(file_keys)} files in bucket "
             f"{bucket_name} with prefix '{prefix}'."
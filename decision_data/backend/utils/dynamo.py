@@ -1,16 +1,20 @@
 """ This use dynamo db as a key value pair storage """
 
 import boto3
+from functools import lru_cache
 from loguru import logger
 from mypy_boto3_dynamodb import DynamoDBClient
-from decision_data.backend.config.config import backend_config
+from decision_data.backend.config.config import backend_config, boto_config
 from decision_data.backend.utils.logger import setup_logger
 
 setup_logger()
 
 
+@lru_cache(maxsize=1)
 def get_dynamodb_client() -> DynamoDBClient:
-    """Get a dynamodb client
+    """Get the shared dynamodb client
+
+    Built on first use and reused for the life of the process.
 
     :return: s3 client seesion
     :rtype: Session
@@ -20,6 +24,7 @@ def get_dynamodb_client() -> DynamoDBClient:
         aws_access_key_id=backend_config.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=backend_config.AWS_SECRET_ACCESS_KEY,
         region_name=backend_config.REGION_NAME,
+        config=boto_config,
     )
     return dynamodb_client
 
@@ -0,0 +1,55 @@
+"""Token bucket rate limiter shared across threads"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` reserves tokens immediately and, if the bucket is in debt,
+    sleeps exactly long enough for the refill to cover it. Waiting callers
+    are therefore served in arrival order, and the sustained throughput is
+    ``rate`` without polling loops.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second. Must be positive.
+            capacity (float): Maximum number of tokens the bucket holds,
+                i.e. the largest burst allowed.
+
+        Raises:
+            ValueError: If rate or capacity is not positive.
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Take tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
@@ -1,8 +1,17 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
+from functools import lru_cache
 from openai import OpenAI
+from openai.types.chat import ChatCompletionMessageParam
+from openai.types.shared_params import ResponseFormatJSONSchema
 from pathlib import Path
 from pydantic import ValidationError
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
 from decision_data.backend.data.mongodb_client import MongoDBClient
 from decision_data.backend.config.config import backend_config
 from decision_data.data_structure.models import Transcript
@@ -12,79 +21,231 @@ from decision_data.ui.email.email import send_email, format_message
 
 setup_logger()
 
+# Structured-output response format for DailySummary, built once at import
+# rather than reflected from the pydantic model on every request. Also used
+# in Batch API request bodies. Strict mode requires additionalProperties to
+# be disabled.
+_DAILY_SUMMARY_RESPONSE_FORMAT: ResponseFormatJSONSchema = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "DailySummary",
+        "schema": {
+            **DailySummary.model_json_schema(),
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
 
-def generate_summary(
-    year: str,
-    month: str,
-    day: str,
-    prompt_path: Path,
-):
-    """Generate a summary of all transcripts on a given day."""
-    # Step 1: Filter transcription by time
+_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+_DATE_FIELD = "created_utc"
+
+# Only fetch the fields Transcript needs; skips _id and anything else stored
+# alongside a transcript.
+_TRANSCRIPT_PROJECTION = {"_id": 0, **dict.fromkeys(Transcript.model_fields, 1)}
+
+# Summaries already generated in this process, keyed by date and a hash of
+# the exact request. A rerun over unchanged transcripts reuses the result
+# instead of paying for another LLM call.
+_SUMMARY_CACHE_TTL = 3600.0
+_SUMMARY_CACHE_MAXSIZE = 1024
+_summary_cache: Dict[Tuple[str, str], Tuple[float, DailySummary]] = {}
+
+
+def _summary_cache_key(
+    date: str,
+    messages: List[ChatCompletionMessageParam],
+) -> Tuple[str, str]:
+    request = json.dumps([backend_config.OPENAI_MODEL, messages])
+    return date, hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def _get_cached_summary(key: Tuple[str, str]) -> Optional[DailySummary]:
+    entry = _summary_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, summary = entry
+    if time.monotonic() >= expires_at:
+        del _summary_cache[key]
+        return None
+    return summary
+
+
+def _cache_summary(key: Tuple[str, str], summary: DailySummary) -> None:
+    if key not in _summary_cache and len(_summary_cache) >= _SUMMARY_CACHE_MAXSIZE:
+        # Dicts keep insertion order, so this evicts the oldest entry.
+        del _summary_cache[next(iter(_summary_cache))]
+    _summary_cache[key] = (time.monotonic() + _SUMMARY_CACHE_TTL, summary)
+
+
+@lru_cache(maxsize=32)
+def _read_prompt(prompt_path: Path, mtime_ns: int) -> str:
+    return prompt_path.read_text()
+
+
+def load_prompt(prompt: Union[str, Path]) -> str:
+    """Get prompt text, reading a prompt file only when it changes on disk.
+
+    :param prompt: prompt text, or path to a prompt file
+    :type prompt: Union[str, Path]
+    :return: prompt text
+    :rtype: str
+    """
+    if isinstance(prompt, str):
+        return prompt
+    return _read_prompt(prompt, prompt.stat().st_mtime_ns)
+
+
+def build_messages(
+    system_prompt: str,
+    transcripts: List[str],
+) -> List[ChatCompletionMessageParam]:
+    """Build the chat messages for one day's summary.
+
+    The instructions go first as a system message that is byte-identical
+    on every call, and only the user message carries the transcript. OpenAI
+    caches a repeated prompt prefix, so the instruction tokens are not
+    reprocessed for every day summarized. The day's transcripts are sent
+    together as one JSON array so that a single request covers them all.
+
+    :param system_prompt: static summary instructions
+    :type system_prompt: str
+    :param transcripts: the day's transcripts, in chronological order
+    :type transcripts: List[str]
+    :return: messages for the chat completions API
+    :rtype: List[ChatCompletionMessageParam]
+    """
+    transcripts_json = json.dumps(
+        [{"id": i, "text": text} for i, text in enumerate(transcripts)],
+        ensure_ascii=False,
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"<source_data>\n{transcripts_json}\n</source_data>",
+        },
+    ]
 
-    mongo_client = MongoDBClient(
+
+# lru_cache alone does not stop concurrent first callers (e.g. the batch
+# path's thread pool) from each building a client; only one would be cached
+# and the others leaked, so the getters below build under this lock.
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _mongo_client(collection: str) -> MongoDBClient:
+    client = MongoDBClient(
         uri=backend_config.MONGODB_URI,
         db=backend_config.MONGODB_DB_NAME,
-        collection=backend_config.MONGODB_TRANSCRIPTS_COLLECTION_NAME,
+        collection=collection,
     )
+    # Set up the date index once per process, off the read path
+    if collection == backend_config.MONGODB_TRANSCRIPTS_COLLECTION_NAME:
+        client.ensure_indexes()
+    return client
+
+
+@lru_cache(maxsize=1)
+def _openai_client() -> OpenAI:
+    return OpenAI(api_key=backend_config.OPENAI_API_KEY)
+
+
+def get_mongo_client(collection: str) -> MongoDBClient:
+    """Get the shared MongoDB client for a collection
+
+    Built once per process and left open, so repeated summaries reuse its
+    connection pool instead of reconnecting and re-authenticating each time.
+
+    :param collection: collection name
+    :type collection: str
+    :return: mongo client for the collection
+    :rtype: MongoDBClient
+    """
+    with _client_lock:
+        return _mongo_client(collection)
+
+
+def get_openai_client() -> OpenAI:
+    """Get the shared OpenAI client
+
+    :return: OpenAI client
+    :rtype: OpenAI
+    """
+    with _client_lock:
+        return _openai_client()
 
-    date_field = "created_utc"
-    offset = backend_config.TIME_OFFSET_FROM_UTC
 
-    # Convert offset to timedelta
-    offset_timedelta = timedelta(hours=offset)
+@lru_cache(maxsize=64)
+def _tz(offset_hours: int) -> timezone:
+    """Get the fixed-offset timezone for an hour offset from UTC."""
+    return timezone(timedelta(hours=offset_hours))
 
-    # Create datetime objects for start and end of the day
-    start_datetime = datetime(int(year), int(month), int(day)) - offset_timedelta
+
+def get_daily_transcripts(
+    year: str,
+    month: str,
+    day: str,
+) -> Optional[List[str]]:
+    """Get all transcripts recorded on a given day, oldest first.
+
+    :return: transcripts, or None if the records could not be parsed
+    :rtype: Optional[List[str]]
+    """
+    mongo_client = get_mongo_client(backend_config.MONGODB_TRANSCRIPTS_COLLECTION_NAME)
+
+    offset = backend_config.TIME_OFFSET_FROM_UTC
+
+    # Create datetime objects for start and end of the day, in UTC
+    start_datetime = datetime(
+        int(year), int(month), int(day), tzinfo=_tz(offset)
+    ).astimezone(timezone.utc)
     end_datetime = start_datetime + timedelta(days=1)
 
     # Format the datetime objects to the required string format
     start_date_str = start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
     end_date_str = end_datetime.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    filtered_data = mongo_client.get_records_between_dates(
-        date_field=date_field,
+    records = mongo_client.iter_records_between_dates(
+        date_field=_DATE_FIELD,
         start_date_str=start_date_str,
         end_date_str=end_date_str,
+        projection=_TRANSCRIPT_PROJECTION,
     )
-    mongo_client.close()
-
-    logger.debug(f"number of transcript on day {day}: {len(filtered_data)}")
-
-    # Step 2: Combine all transcript into a single text
 
+    # Validate records as they stream in so that only the transcript text,
+    # not every raw document, is held for the whole day.
+    transcripts = []
     try:
-        filtered_objects = [Transcript(**x) for x in filtered_data]
+        for record in records:
+            transcripts.append(Transcript(**record).transcript)
     except ValidationError:
-        logger.debug(f"filtered data: {filtered_data}")
+        logger.debug(f"invalid record: {record}")
         logger.error("Failed to parse the transcript data. Probably missing fields.")
-        return
-
-    transcripts = [x.transcript for x in filtered_objects]
-    combined_text = " ".join(transcripts)
-    # logger.debug(f"combined text: {combined_text}")
+        return None
 
-    # Step 3: Summarize the text using LLM
-    daily_summary_prompt = prompt_path.read_text()
+    logger.debug(f"number of transcript on day {day}: {len(transcripts)}")
 
-    user_prompt = daily_summary_prompt.format(daily_transcript=combined_text)
-    logger.debug(f"user prompt: {user_prompt}")
+    return transcripts
 
-    client = OpenAI(api_key=backend_config.OPENAI_API_KEY)
 
-    completion = client.beta.chat.completions.parse(
-        model=backend_config.OPENAI_MODEL,
-        messages=[
-            {"role": "user", "content": user_prompt},
-        ],
-        response_format=DailySummary,
-    )
-
-    parsed_response = completion.choices[0].message.parsed
-
-    if not parsed_response:
-        raise ValueError("Parsed response is None")
+def deliver_summary(
+    parsed_response: DailySummary,
+    year: str,
+    month: str,
+    day: str,
+    save: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """Email the summary and save it to MongoDB, unless it is empty.
 
+    :param save: insert the record right away; pass False to collect records
+        and write them together with ``insert_daily_summaries``
+    :type save: bool, optional
+    :return: the summary record, or None if the summary was empty
+    :rtype: Optional[Dict[str, Any]]
+    """
     # If there is no information, do not send the email or save to database
     if (
         not parsed_response.business_info
@@ -92,13 +253,13 @@ def generate_summary(
         and not parsed_response.misc_info
     ):
         logger.info("No information to summarize.")
-        return
+        return None
 
-    # Step 4: Send the summary to myself using email
+    # Send the summary to myself using email
     subject = "PANZOTO: Daily Summary"
     date = f"{year}-{month}-{day}"
     formated_message = format_message(
-        llm_resopnse=parsed_response,
+        llm_response=parsed_response,
         date=date,
     )
 
@@ -108,17 +269,198 @@ def generate_summary(
         recipient_email=backend_config.GMAIL_ACCOUNT,
     )
 
-    # Step 5: Save the summary to MongoDB
-    mongo_client = MongoDBClient(
-        uri=backend_config.MONGODB_URI,
-        db=backend_config.MONGODB_DB_NAME,
-        collection=backend_config.MONGODB_DAILY_SUMMARY_COLLECTION_NAME,
-    )
     record = parsed_response.model_dump()
-    record[date_field] = date
+    record[_DATE_FIELD] = date
+    if not save:
+        return record
+
+    # Save the summary to MongoDB
+    mongo_client = get_mongo_client(
+        backend_config.MONGODB_DAILY_SUMMARY_COLLECTION_NAME
+    )
     mongo_client.insert_daily_summary(summary_data=[record])
-    logger.info(f"Inserted one summary on day: {start_date_str}.")
-    mongo_client.close()
+    logger.info(f"Inserted one summary on day: {date}.")
+    return record
+
+
+def generate_summary(
+    year: str,
+    month: str,
+    day: str,
+    prompt: Union[str, Path],
+):
+    """Generate a summary of all transcripts on a given day."""
+    # Step 1: Filter transcription by time and combine into a single text
+    transcripts = get_daily_transcripts(year=year, month=month, day=day)
+    if transcripts is None:
+        return
+
+    # Nothing was recorded, so there is nothing for the LLM to summarize
+    if not transcripts:
+        logger.info(f"No transcripts on {year}-{month}-{day}.")
+        return
+
+    # Step 2: Summarize the text using LLM
+    messages = build_messages(load_prompt(prompt), transcripts)
+    logger.debug(f"prompt messages: {messages}")
+
+    cache_key = _summary_cache_key(f"{year}-{month}-{day}", messages)
+    parsed_response = _get_cached_summary(cache_key)
+    if parsed_response is None:
+        client = get_openai_client()
+
+        completion = client.chat.completions.create(
+            model=backend_config.OPENAI_MODEL,
+            messages=messages,
+            response_format=_DAILY_SUMMARY_RESPONSE_FORMAT,
+        )
+
+        content = completion.choices[0].message.content
+
+        # A refusal comes back with no content
+        if not content:
+            raise ValueError("Response content is empty")
+        parsed_response = DailySummary.model_validate_json(content)
+        _cache_summary(cache_key, parsed_response)
+    else:
+        logger.info(f"Reusing cached summary for {year}-{month}-{day}.")
+
+    # Step 3: Email the summary and save it to MongoDB
+    deliver_summary(parsed_response, year=year, month=month, day=day)
+
+
+def generate_summaries_batch(
+    dates: List[Tuple[str, str, str]],
+    prompt: Union[str, Path],
+    poll_interval: float = 60.0,
+) -> None:
+    """Summarize several days with a single OpenAI Batch API job.
+
+    Meant for backfills and catch-up runs that can wait for the result.
+    Batch requests cost half as much as synchronous calls and draw on a
+    separate rate limit. One request per day is written to a JSONL file,
+    submitted as one batch, and polled until it finishes. Each parsed
+    summary is then emailed like ``generate_summary`` does, and all of them
+    are saved to MongoDB in one bulk write.
+
+    :param dates: ``(year, month, day)`` tuples to summarize
+    :type dates: List[Tuple[str, str, str]]
+    :param prompt: daily summary prompt text, or path to the prompt file
+    :type prompt: Union[str, Path]
+    :param poll_interval: seconds between batch status checks, defaults to 60
+    :type poll_interval: float, optional
+    """
+    system_prompt = load_prompt(prompt)
+
+    # Each day's transcript read is an independent MongoDB round-trip, so
+    # overlap them with a bounded pool instead of reading one day at a time.
+    with ThreadPoolExecutor(max_workers=min(10, len(dates) or 1)) as pool:
+        daily_transcripts = list(
+            pool.map(lambda date: get_daily_transcripts(*date), dates)
+        )
+
+    batch_lines = []
+    cache_keys = {}
+    summaries: Dict[str, DailySummary] = {}
+    for (year, month, day), transcripts in zip(dates, daily_transcripts):
+        if not transcripts:
+            continue
+        messages = build_messages(system_prompt, transcripts)
+        date = f"{year}-{month}-{day}"
+        cache_key = _summary_cache_key(date, messages)
+        cached_summary = _get_cached_summary(cache_key)
+        if cached_summary is not None:
+            logger.info(f"Reusing cached summary for {date}.")
+            summaries[date] = cached_summary
+            continue
+        cache_keys[date] = cache_key
+        batch_lines.append(
+            json.dumps(
+                {
+                    "custom_id": date,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": backend_config.OPENAI_MODEL,
+                        "messages": messages,
+                        "response_format": _DAILY_SUMMARY_RESPONSE_FORMAT,
+                    },
+                }
+            )
+        )
+
+    if batch_lines:
+        batch_summaries = _run_batch(batch_lines, poll_interval=poll_interval)
+        for date, parsed_response in batch_summaries.items():
+            _cache_summary(cache_keys[date], parsed_response)
+        summaries.update(batch_summaries)
+
+    if not summaries:
+        logger.info("No days to summarize.")
+        return
+
+    # Email each day's summary, then save them all in one bulk write
+    records = []
+    for date, parsed_response in summaries.items():
+        year, month, day = date.split("-")
+        record = deliver_summary(
+            parsed_response, year=year, month=month, day=day, save=False
+        )
+        if record is not None:
+            records.append(record)
+
+    if records:
+        mongo_client = get_mongo_client(
+            backend_config.MONGODB_DAILY_SUMMARY_COLLECTION_NAME
+        )
+        mongo_client.insert_daily_summaries(records)
+
+
+def _run_batch(
+    batch_lines: List[str],
+    poll_interval: float,
+) -> Dict[str, DailySummary]:
+    """Submit batch requests, wait for the job and parse each summary.
+
+    :return: parsed summaries keyed by custom_id, empty if the job failed
+    :rtype: Dict[str, DailySummary]
+    """
+    client = get_openai_client()
+
+    batch_file = client.files.create(
+        file=("daily_summaries.jsonl", "\n".join(batch_lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"Submitted batch {batch.id} for {len(batch_lines)} days.")
+
+    while batch.status not in _BATCH_TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.error(f"Batch {batch.id} finished with status {batch.status}.")
+        return {}
+
+    summaries = {}
+    output = client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            logger.error(f"Summary for {result['custom_id']} failed: {result}")
+            continue
+
+        content = response["body"]["choices"][0]["message"]["content"]
+        try:
+            summaries[result["custom_id"]] = DailySummary.model_validate_json(content)
+        except ValidationError:
+            logger.error(f"Failed to parse summary for {result['custom_id']}.")
+    return summaries
 
 
 def main():
@@ -128,7 +470,7 @@ def main():
         year="2024",
         month="12",
         day="21",
-        prompt_path=prompt_path,
+        prompt=prompt_path,
     )
 
 
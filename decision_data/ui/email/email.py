@@ -1,36 +1,396 @@
 """Send an email"""
 
+import atexit
+import html
+import queue
+import re
 import smtplib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from decision_data.backend.config.config import backend_config
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email import policy
+from email.header import Header
+from decision_data.backend.utils.rate_limiter import TokenBucket
 from decision_data.data_structure.models import DailySummary
 
+SMTP_SERVER = "smtp.gmail.com"
+SMTP_PORT = 587
+
+# Recipients per message for bulk sends, the same cap SES applies to a
+# single bulk request.
+MAX_RECIPIENTS_PER_MESSAGE = 50
+
+# Bytes written to the socket per send() while streaming a message body
+_DATA_CHUNK_SIZE = 16 * 1024
+
+# HTML skeleton of the daily summary email, filled in by format_message
+_MESSAGE_TEMPLATE = (
+    "<h2>{date}</h2>\n"
+    "<h2>Family</h2>\n<ul>\n{family}</ul>\n"
+    "<h2>Business</h2>\n<ul>\n{business}</ul>\n"
+    "<h2>Misc</h2>\n<ul>\n{misc}</ul>\n"
+)
+
+# Keeps concurrent senders under the provider's sending rate instead of
+# bursting past it and getting throttled.
+_send_bucket = TokenBucket(
+    rate=backend_config.EMAIL_MAX_SEND_RATE,
+    capacity=backend_config.EMAIL_MAX_SEND_RATE,
+)
+
+
+class PipeliningSMTP(smtplib.SMTP):
+    """
+    SMTP client that pipelines the message envelope (RFC 2920).
+
+    ``smtplib.SMTP.sendmail`` waits for the reply to MAIL FROM, each RCPT TO
+    and DATA in turn. When the server advertises PIPELINING these commands
+    are written in a single packet and their replies read afterwards, so the
+    envelope costs one round-trip instead of one per command. Servers
+    without the extension fall back to the standard behaviour.
+    """
+
+    def _reset(self) -> None:
+        """Abort the transaction, tolerating a server that already hung up."""
+        try:
+            self.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+    def sendmail(
+        self,
+        from_addr: str,
+        to_addrs: Union[str, Sequence[str]],
+        msg,
+        mail_options: Sequence[str] = (),
+        rcpt_options: Sequence[str] = (),
+    ) -> Dict[str, Tuple[int, bytes]]:
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining"):
+            return super().sendmail(
+                from_addr, to_addrs, msg, mail_options, rcpt_options
+            )
+
+        if isinstance(msg, str):
+            msg = re.sub(r"\r\n|\r|\n", "\r\n", msg).encode("ascii")
+        else:
+            msg = bytes(msg)
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        mail_opts = list(mail_options)
+        if self.has_extn("size"):
+            mail_opts.insert(0, "size=%d" % len(msg))
+        mail_suffix = "".join(" " + option for option in mail_opts)
+        rcpt_suffix = "".join(" " + option for option in rcpt_options)
+
+        commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{mail_suffix}\r\n"]
+        commands.extend(
+            f"rcpt TO:{smtplib.quoteaddr(recipient)}{rcpt_suffix}\r\n"
+            for recipient in to_addrs
+        )
+        commands.append("data\r\n")
+        self.send("".join(commands))
+
+        mail_code, mail_resp = self.getreply()
+        senderrs: Dict[str, Tuple[int, bytes]] = {}
+        for recipient in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                senderrs[recipient] = (code, resp)
+        data_code, data_resp = self.getreply()
+
+        if mail_code != 250 or len(senderrs) == len(to_addrs) or data_code != 354:
+            if data_code == 354:
+                # The server is waiting for a body we are not going to send.
+                self.send(b".\r\n")
+                self.getreply()
+            self._reset()
+            if mail_code != 250:
+                raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+            if len(senderrs) == len(to_addrs):
+                raise smtplib.SMTPRecipientsRefused(senderrs)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        # Dot-stuff only when needed, then stream the body in fixed-size
+        # slices of a memoryview instead of concatenating the terminator onto
+        # a second full copy of the message.
+        if msg.startswith(b".") or b"\n." in msg:
+            msg = re.sub(rb"(?m)^\.", b"..", msg)
+        payload = memoryview(msg)
+        for start in range(0, len(payload), _DATA_CHUNK_SIZE):
+            end = start + _DATA_CHUNK_SIZE
+            self.send(payload[start:end])
+        self.send(b".\r\n" if msg.endswith(b"\r\n") else b"\r\n.\r\n")
+        code, resp = self.getreply()
+        if code != 250:
+            self._reset()
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+
+class _PooledConnection:
+    """An authenticated SMTP session plus the bookkeeping the pool needs."""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """
+    A pool of authenticated SMTP connections to a single server and account.
+
+    Opening a connection costs a TCP handshake, STARTTLS and AUTH before the
+    first message can be sent. The pool keeps logged-in sessions around so
+    that later sends only pay for the message itself. A connection is
+    retired after ``max_messages_per_conn`` messages or once it has been idle
+    longer than ``idle_timeout`` seconds, and at most ``max_conns``
+    connections are open at any time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        max_conns: int = 10,
+        max_messages_per_conn: int = 100,
+        idle_timeout: float = 60.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_messages_per_conn = max_messages_per_conn
+        self.idle_timeout = idle_timeout
+        self._idle: queue.LifoQueue[_PooledConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_conns)
+
+    def _connect(self) -> _PooledConnection:
+        server = PipeliningSMTP(self.host, self.port)
+        try:
+            server.starttls()
+            server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _quit(conn: _PooledConnection) -> None:
+        try:
+            conn.server.quit()
+        except smtplib.SMTPException:
+            conn.server.close()
+
+    def acquire(self) -> _PooledConnection:
+        """Take an idle connection from the pool, or open a new one."""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - conn.last_used < self.idle_timeout:
+                    return conn
+                self._quit(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: _PooledConnection, discard: bool = False) -> None:
+        """Return a connection to the pool, retiring it if it is used up."""
+        try:
+            if discard:
+                conn.server.close()
+            elif conn.messages_sent >= self.max_messages_per_conn:
+                self._quit(conn)
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a logged-in SMTP session for the duration of the block.
+
+        The session is discarded rather than returned to the pool if the
+        block raises anything, including ``KeyboardInterrupt``, since its
+        protocol state is then unknown. Its slot is always given back.
+        """
+        conn = self.acquire()
+        discard = True
+        try:
+            yield conn.server
+            conn.messages_sent += 1
+            discard = False
+        finally:
+            self.release(conn, discard=discard)
+
+    def close(self) -> None:
+        """Log out of every idle connection."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(conn)
+
+
+_pools: Dict[Tuple[str, int, str, str], SMTPPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(host: str, port: int, user: str, password: str) -> SMTPPool:
+    """Get the shared connection pool for a server and account
+
+    Creation is guarded by a lock so that concurrent first senders share one
+    pool, and with it one ``max_conns`` limit.
+
+    :return: SMTP connection pool
+    :rtype: SMTPPool
+    """
+    key = (host, port, user, password)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SMTPPool(
+                host=host, port=port, user=user, password=password
+            )
+        return pool
+
+
+@atexit.register
+def close_pool() -> None:
+    """Log out of every pooled SMTP connection and forget the pools
+
+    Registered to run at interpreter exit so that the server sees a clean
+    QUIT instead of a dropped socket. Safe to call more than once; the next
+    send opens a fresh pool.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _bullets(items: Sequence[str]) -> str:
+    """Render items as escaped ``<li>`` elements with a single join."""
+    if not items:
+        return ""
+    return "<li>" + "</li>\n<li>".join(map(html.escape, items)) + "</li>\n"
+
 
 def format_message(
-    llm_resopnse: DailySummary,
+    llm_response: DailySummary,
     date: str,
 ) -> str:
-    """Format the LLM response into an HTML email message."""
-    body = f"""
-    <h2>{date}</h2>
-    <h2>Family</h2>
-    <ul>
-        {''.join([f'<li>{item}</li>' for item in llm_resopnse.family_info])}
-    </ul>
-
-    <h2>Business</h2>
-    <ul>
-        {''.join([f'<li>{item}</li>' for item in llm_resopnse.business_info])}
-    </ul>
-
-    <h2>Misc</h2>
-    <ul>
-        {''.join([f'<li>{item}</li>' for item in llm_resopnse.misc_info])}
-    </ul>
+    """Format the LLM response into an HTML email message.
+
+    Items are HTML-escaped so summaries containing ``<`` or ``&`` render as
+    text instead of breaking the markup. The rendered HTML is memoised, so
+    formatting the same summary again (retries, several recipients) is a
+    cache lookup.
     """
+    return _format_message_cached(
+        date,
+        tuple(llm_response.family_info),
+        tuple(llm_response.business_info),
+        tuple(llm_response.misc_info),
+    )
 
-    return body
+
+@lru_cache(maxsize=128)
+def _format_message_cached(
+    date: str,
+    family_info: Tuple[str, ...],
+    business_info: Tuple[str, ...],
+    misc_info: Tuple[str, ...],
+) -> str:
+    return _MESSAGE_TEMPLATE.format_map(
+        {
+            "date": html.escape(date),
+            "family": _bullets(family_info),
+            "business": _bullets(business_info),
+            "misc": _bullets(misc_info),
+        }
+    )
+
+
+def _build_message(
+    sender_email: str,
+    to_header: str,
+    subject: str,
+    message_body: str,
+) -> bytes:
+    """Build an HTML email ready to hand to ``sendmail``.
+
+    The body is a single HTML part, so the headers are written directly and
+    the body is sent as 8bit UTF-8, skipping the ``email`` package's
+    generator and transfer encoding. Bodies with lines longer than SMTP's
+    998-byte limit fall back to a base64 encoded ``MIMEText``.
+    """
+    for value in (sender_email, to_header, subject):
+        if "\r" in value or "\n" in value:
+            raise ValueError("Email headers must not contain line breaks.")
+
+    # Only CR/LF are line breaks here; str.splitlines would also split on
+    # characters such as U+2028 and alter the text.
+    body = re.sub(r"\r\n|\r|\n", "\r\n", message_body).encode("utf-8")
+    if any(len(line) > 998 for line in body.split(b"\r\n")):
+        msg = MIMEText(message_body, "html", "utf-8")
+        msg["From"] = sender_email
+        msg["To"] = to_header
+        msg["Subject"] = subject  # Subject line
+        # The SMTP policy emits CRLF line endings, which sendmail does not
+        # add for bytes input.
+        return msg.as_bytes(policy=policy.SMTP)
+
+    if not subject.isascii():
+        subject = Header(subject, "utf-8").encode()
+
+    headers = (
+        f"From: {sender_email}\r\n"
+        f"To: {to_header}\r\n"
+        f"Subject: {subject}\r\n"
+        "MIME-Version: 1.0\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        "Content-Transfer-Encoding: 8bit\r\n"
+        "\r\n"
+    )
+    return headers.encode("utf-8") + body
+
+
+def _deliver(sender_email: str, recipients: List[str], msg: bytes) -> None:
+    """Send one message to the envelope recipients over a pooled connection."""
+    pool = get_smtp_pool(
+        SMTP_SERVER, SMTP_PORT, sender_email, backend_config.GOOGLE_APP_PASSWORD
+    )
+
+    _send_bucket.acquire()
+
+    # A pooled connection may have been dropped by the server while idle, so
+    # retry once on a fresh one.
+    for attempt in range(2):
+        try:
+            with pool.connection() as server:
+                mail_options = ["BODY=8BITMIME"] if server.has_extn("8bitmime") else []
+                server.sendmail(sender_email, recipients, msg, mail_options)
+            return
+        except smtplib.SMTPServerDisconnected:
+            if attempt:
+                raise
 
 
 def send_email(
@@ -38,27 +398,181 @@ def send_email(
     subject: str,
     message_body: str,
 ) -> str:
-    """Sending an email to a recipient using the smtplib library."""
-    # Set your email credentials (Gmail example)
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 587
+    """Sending an email to a recipient over a pooled SMTP connection."""
     sender_email = backend_config.GMAIL_ACCOUNT
-    sender_password = backend_config.GOOGLE_APP_PASSWORD
+    msg = _build_message(sender_email, recipient_email, subject, message_body)
+
+    # Send the email (which will be received as an SMS)
+    _deliver(sender_email, [recipient_email], msg)
 
-    # Create the email message object
-    msg = MIMEMultipart()
-    msg["From"] = sender_email
-    msg["To"] = recipient_email
-    msg["Subject"] = subject  # Subject line
+    return "Message sent successfully"
 
-    # Attach the message body (plain text)
-    body = MIMEText(message_body, "html")
-    msg.attach(body)
 
-    # Send the email (which will be received as an SMS)
-    with smtplib.SMTP(smtp_server, smtp_port) as server:
-        server.starttls()
-        server.login(sender_email, sender_password)
-        server.sendmail(sender_email, recipient_email, msg.as_string())
+def send_bulk_email(
+    recipients: List[str],
+    subject: str,
+    message_body: str,
+    batch_size: int = MAX_RECIPIENTS_PER_MESSAGE,
+) -> str:
+    """Send the same email to many recipients in as few messages as possible.
+
+    Recipients are grouped ``batch_size`` at a time into a single SMTP
+    transaction, so N recipients cost ceil(N / batch_size) sends instead of
+    N. Recipients only appear in the envelope, never in the headers, so they
+    do not see each other's addresses.
+
+    :param recipients: email addresses to deliver to
+    :type recipients: List[str]
+    :param subject: subject line
+    :type subject: str
+    :param message_body: HTML body
+    :type message_body: str
+    :param batch_size: recipients per message, defaults to 50
+    :type batch_size: int, optional
+    :return: status message
+    :rtype: str
+    """
+    sender_email = backend_config.GMAIL_ACCOUNT
+    msg = _build_message(
+        sender_email, "undisclosed-recipients:;", subject, message_body
+    )
+
+    for start in range(0, len(recipients), batch_size):
+        end = start + batch_size
+        _deliver(sender_email, recipients[start:end], msg)
 
     return "Message sent successfully"
+
+
+def send_emails(
+    messages: List[Tuple[str, str, str]],
+    max_workers: int = 10,
+) -> List[str]:
+    """Send several emails concurrently.
+
+    Each send blocks on network round-trips, so the messages are dispatched
+    from a thread pool instead of one after another. Gmail accepts at most
+    10 simultaneous SMTP connections per account, hence the default. Every
+    send still passes through the shared token bucket, so the fan-out stays
+    within ``EMAIL_MAX_SEND_RATE``.
+
+    :param messages: ``(recipient_email, subject, message_body)`` tuples
+    :type messages: List[Tuple[str, str, str]]
+    :param max_workers: maximum number of concurrent sends, defaults to 10
+    :type max_workers: int, optional
+    :return: status of each send, in the same order as ``messages``
+    :rtype: List[str]
+    """
+    if not messages:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(messages))) as pool:
+        futures = [
+            pool.submit(
+                send_email,
+                recipient_email=recipient_email,
+                subject=subject,
+                message_body=message_body,
+            )
+            for recipient_email, subject, message_body in messages
+        ]
+        return [future.result() for future in futures]
+
+
+class EmailDispatcher:
+    """
+    Send emails from a background thread, batching whatever is queued.
+
+    ``submit`` returns a ``Future`` immediately, so callers do not wait on
+    SMTP round-trips. The worker thread blocks for the first queued email,
+    then keeps collecting for up to ``batch_wait`` seconds or until it has
+    ``batch_max`` emails. Emails in a batch that share a subject and body go
+    out as one ``send_bulk_email`` transaction, and the rest go out with
+    ``send_email``.
+    """
+
+    def __init__(
+        self,
+        batch_max: int = MAX_RECIPIENTS_PER_MESSAGE,
+        batch_wait: float = 0.02,
+    ):
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait
+        self._queue: queue.Queue[Optional[Tuple[str, str, str, Future]]] = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="email-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        recipient_email: str,
+        subject: str,
+        message_body: str,
+    ) -> Future:
+        """Queue an email and return a future holding the send status.
+
+        :raises RuntimeError: if the dispatcher has been closed
+        """
+        future: Future = Future()
+        # The lock keeps an email from being queued behind close's sentinel,
+        # where no worker would ever resolve its future.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed EmailDispatcher.")
+            self._queue.put((recipient_email, subject, message_body, future))
+        return future
+
+    def close(self) -> None:
+        """Send everything already queued, then stop the worker thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self) -> Tuple[List[Tuple[str, str, str, Future]], bool]:
+        batch = []
+        item = self._queue.get()
+        deadline = time.monotonic() + self.batch_wait
+        while item is not None:
+            batch.append(item)
+            timeout = deadline - time.monotonic()
+            if len(batch) >= self.batch_max or timeout <= 0:
+                return batch, False
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch, stopped = self._next_batch()
+
+            groups: Dict[Tuple[str, str], List[Tuple[str, Future]]] = {}
+            for recipient_email, subject, message_body, future in batch:
+                # Skip emails whose caller cancelled the future; resolving a
+                # cancelled future would raise and kill this worker thread.
+                if not future.set_running_or_notify_cancel():
+                    continue
+                groups.setdefault((subject, message_body), []).append(
+                    (recipient_email, future)
+                )
+
+            for (subject, message_body), items in groups.items():
+                recipients = [recipient_email for recipient_email, _ in items]
+                try:
+                    if len(recipients) == 1:
+                        result = send_email(recipients[0], subject, message_body)
+                    else:
+                        result = send_bulk_email(recipients, subject, message_body)
+                except Exception as e:
+                    for _, future in items:
+                        future.set_exception(e)
+                else:
+                    for _, future in items:
+                        future.set_result(result)
@@ -1,11 +1,13 @@
 import pytest
 from unittest.mock import patch
+from pymongo import InsertOne
+from pymongo.errors import OperationFailure
 from datetime import datetime
 from decision_data.backend.data.mongodb_client import MongoDBClient
 
 
-@pytest.fixture
-def mongodb_client():
+@pytest.fixture(scope="module")
+def mongodb_client_module():
     with patch(
         "decision_data.backend.data.mongodb_client.MongoClient"
     ) as MockMongoClient:
@@ -19,6 +21,17 @@ def mongodb_client():
         client.close()
 
 
+@pytest.fixture
+def mongodb_client(mongodb_client_module):
+    # Build the mock graph once per module and only clear recorded calls
+    # between tests.
+    _, mock_client, mock_db, mock_collection = mongodb_client_module
+    mock_client.reset_mock()
+    mock_db.reset_mock()
+    mock_collection.reset_mock(return_value=True, side_effect=True)
+    return mongodb_client_module
+
+
 def test_init(mongodb_client):
     client, mock_client, mock_db, mock_collection = mongodb_client
     assert client.client == mock_client
@@ -54,6 +67,7 @@ def test_get_records_between_dates(mongodb_client):
         date_field="created_utc", start_date_str=start_date, end_date_str=end_date
     )
 
+    mock_collection.create_index.assert_not_called()
     mock_collection.find.assert_called_once_with(
         {
             "created_utc": {
@@ -61,13 +75,86 @@ def test_get_records_between_dates(mongodb_client):
                 "$lte": "2023-01-31 23:59:59",
             },
             "transcript": {"$regex": ".{4,}"},
-        }
+        },
+        projection=None,
     )
     mock_collection.find.return_value.sort.assert_called_once_with("created_utc", 1)
     assert result == mock_data
 
 
+def test_ensure_indexes(mongodb_client):
+    client, _, _, mock_collection = mongodb_client
+
+    client.ensure_indexes()
+
+    mock_collection.create_index.assert_called_once_with([("created_utc", 1)])
+
+
+def test_ensure_indexes_without_privileges(mongodb_client):
+    client, _, _, mock_collection = mongodb_client
+    mock_collection.create_index.side_effect = OperationFailure("not authorized")
+    mock_collection.find.return_value.sort.return_value = []
+
+    # A read-only user still gets to query, just without the index
+    client.ensure_indexes()
+    result = client.get_records_between_dates(
+        date_field="created_utc",
+        start_date_str="2023-01-01 00:00:00",
+        end_date_str="2023-01-31 23:59:59",
+    )
+
+    assert result == []
+    mock_collection.find.assert_called_once()
+
+
+def test_get_records_between_dates_projection(mongodb_client):
+    client, _, _, mock_collection = mongodb_client
+    projection = {"_id": 0, "transcript": 1}
+
+    client.get_records_between_dates(
+        date_field="created_utc",
+        start_date_str="2023-01-01 00:00:00",
+        end_date_str="2023-01-31 23:59:59",
+        projection=projection,
+    )
+
+    assert mock_collection.find.call_args.kwargs["projection"] == projection
+
+
+def test_iter_records_between_dates(mongodb_client):
+    client, _, _, mock_collection = mongodb_client
+    mock_data = [{"transcript": f"record {i}"} for i in range(250)]
+    mock_cursor = mock_collection.find.return_value.sort.return_value
+    mock_cursor.batch_size.return_value = iter(mock_data)
+
+    records = client.iter_records_between_dates(
+        date_field="created_utc",
+        start_date_str="2023-01-01 00:00:00",
+        end_date_str="2023-01-31 23:59:59",
+        batch_size=100,
+    )
+
+    # Nothing is queried until the caller starts iterating.
+    mock_collection.find.assert_not_called()
+    assert list(records) == mock_data
+    mock_cursor.batch_size.assert_called_once_with(100)
+
+
 def test_close(mongodb_client):
     client, mock_client, _, _ = mongodb_client
     client.close()
     mock_client.close.assert_called_once()
+
+
+def test_bulk_insert_daily_summaries(mongodb_client):
+    client, _, _, mock_collection = mongodb_client
+    summaries = [
+        {"family_info": [f"event {day}"], "created_utc": f"2024-12-{day}"}
+        for day in ("11", "12", "13")
+    ]
+
+    client.insert_daily_summaries(summaries)
+
+    mock_collection.bulk_write.assert_called_once_with(
+        [InsertOne(summary) for summary in summaries], ordered=False
+    )
@@ -4,12 +4,18 @@ from decision_data.backend.data.reddit import RedditScraper
 from decision_data.backend.config.config import backend_config
 
 
-@pytest.fixture
-def mock_reddit_client():
+@pytest.fixture(scope="module")
+def mock_reddit_client_module():
     with patch("praw.Reddit") as mock:
         yield mock
 
 
+@pytest.fixture
+def mock_reddit_client(mock_reddit_client_module):
+    mock_reddit_client_module.reset_mock(return_value=True, side_effect=True)
+    return mock_reddit_client_module
+
+
 def test_reddit_scraper_initialization(mock_reddit_client):
     # Arrange
     mock_reddit_instance = MagicMock()
@@ -5,8 +5,11 @@ from decision_data.backend.services.controller import (
 from pathlib import Path
 from decision_data.backend.config.config import backend_config
 from datetime import datetime, timezone
+import time
 import pytest
 
+MAX_ITERATIONS = 3
+
 
 def test_get_current_time():
     # Arrange
@@ -32,8 +35,18 @@ def mock_generate_summary(mocker):
 
 
 @pytest.fixture
-def mock_time_sleep(mocker):
-    return mocker.patch("time.sleep")
+def sleep_calls(monkeypatch):
+    # Count sleeps with a plain closure and break the controller loop after
+    # a few iterations.
+    calls = {"n": 0}
+
+    def fake_sleep(*args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] >= MAX_ITERATIONS:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(time, "sleep", fake_sleep)
+    return calls
 
 
 @pytest.fixture
@@ -48,7 +61,7 @@ def mock_datetime_now(mocker):
 def test_automation_controler(
     mock_transcribe_and_upload,
     mock_generate_summary,
-    mock_time_sleep,
+    sleep_calls,
     mock_datetime_now,
 ):
     # Arrange
@@ -57,18 +70,6 @@ def test_automation_controler(
     backend_config.DAILY_SUMMARY_HOUR = 12
     backend_config.TRANSCRIBER_INTERVAL = 1
 
-    # Use a counter to break the loop after a few iterations
-    loop_counter = 0
-    max_iterations = 3
-
-    def side_effect(*args, **kwargs):
-        nonlocal loop_counter
-        loop_counter += 1
-        if loop_counter >= max_iterations:
-            raise KeyboardInterrupt
-
-    mock_time_sleep.side_effect = side_effect
-
     # Act
     try:
         automation_controler()
@@ -76,20 +77,20 @@ def test_automation_controler(
         pass
 
     # Assert
-    assert mock_transcribe_and_upload.call_count == max_iterations
+    assert mock_transcribe_and_upload.call_count == MAX_ITERATIONS
     mock_generate_summary.assert_called_once_with(
         year="2024",
         month="12",
         day="21",
-        prompt_path=Path(backend_config.DAILY_SUMMAYR_PROMPT_PATH),
+        prompt=Path(backend_config.DAILY_SUMMAYR_PROMPT_PATH),
     )
-    assert mock_time_sleep.call_count == max_iterations
+    assert sleep_calls["n"] == MAX_ITERATIONS
 
 
 def test_automation_controler_reset(
     mock_transcribe_and_upload,
     mock_generate_summary,
-    mock_time_sleep,
+    sleep_calls,
     mock_datetime_now,
 ):
     # Arrange
@@ -103,18 +104,6 @@ def test_automation_controler_reset(
         2024, 12, 21, 23, 59, 59, tzinfo=timezone.utc
     )
 
-    # Use a counter to break the loop after a few iterations
-    loop_counter = 0
-    max_iterations = 3
-
-    def side_effect(*args, **kwargs):
-        nonlocal loop_counter
-        loop_counter += 1
-        if loop_counter >= max_iterations:
-            raise KeyboardInterrupt
-
-    mock_time_sleep.side_effect = side_effect
-
     # Act
     try:
         automation_controler()
@@ -122,6 +111,6 @@ def test_automation_controler_reset(
         pass
 
     # Assert
-    assert mock_transcribe_and_upload.call_count == max_iterations
+    assert mock_transcribe_and_upload.call_count == MAX_ITERATIONS
     mock_generate_summary.assert_not_called()
-    assert mock_time_sleep.call_count == max_iterations
+    assert sleep_calls["n"] == MAX_ITERATIONS
@@ -8,17 +8,24 @@ from decision_data.backend.transcribe.aws_s3 import (
     download_from_s3,
     get_s3_client,
 )
-from decision_data.backend.config.config import backend_config
+from decision_data.backend.config.config import backend_config, boto_config
 
 
-@pytest.fixture
-def mock_s3_client():
+@pytest.fixture(scope="module")
+def mock_s3_client_module():
     with patch("decision_data.backend.transcribe.aws_s3.get_s3_client") as mock:
         yield mock
 
 
+@pytest.fixture
+def mock_s3_client(mock_s3_client_module):
+    mock_s3_client_module.reset_mock(return_value=True, side_effect=True)
+    return mock_s3_client_module
+
+
 def test_get_s3_client():
     # Arrange
+    get_s3_client.cache_clear()
     with patch("boto3.client") as mock_boto_client:
         mock_boto_client.return_value = MagicMock()
 
@@ -31,8 +38,24 @@ def test_get_s3_client():
             aws_access_key_id=backend_config.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=backend_config.AWS_SECRET_ACCESS_KEY,
             region_name=backend_config.REGION_NAME,
+            config=boto_config,
         )
         assert client == mock_boto_client.return_value
+    get_s3_client.cache_clear()
+
+
+def test_get_s3_client_reused():
+    # Arrange
+    get_s3_client.cache_clear()
+    with patch("boto3.client") as mock_boto_client:
+        # Act
+        first = get_s3_client()
+        second = get_s3_client()
+
+        # Assert
+        mock_boto_client.assert_called_once()
+        assert first is second
+    get_s3_client.cache_clear()
 
 
 def test_upload_to_s3(mock_s3_client):
@@ -71,6 +94,24 @@ def test_list_s3_files(mock_s3_client):
     assert result == ["test/file1.txt", "test/file2.txt"]
 
 
+def test_list_s3_files_multiple_pages(mock_s3_client):
+    # Arrange
+    prefix = "test/"
+    mock_client = MagicMock()
+    mock_s3_client.return_value = mock_client
+    mock_client.get_paginator.return_value.paginate.return_value = [
+        {"Contents": [{"Key": "test/"}, {"Key": "test/file1.txt"}]},
+        {},
+        {"Contents": [{"Key": "test/sub/"}, {"Key": "test/file2.txt"}]},
+    ]
+
+    # Act
+    result = list_s3_files("test-bucket", prefix)
+
+    # Assert
+    assert result == ["test/file1.txt", "test/file2.txt"]
+
+
 def test_list_s3_files_client_error(mock_s3_client):
     # Arrange
     bucket_name = "test-bucket"
@@ -7,12 +7,18 @@ from decision_data.backend.transcribe.whisper import (
 )
 
 
-@pytest.fixture
-def mock_openai_client():
+@pytest.fixture(scope="module")
+def mock_openai_client_module():
     with patch("decision_data.backend.transcribe.whisper.OpenAI") as mock:
         yield mock
 
 
+@pytest.fixture
+def mock_openai_client(mock_openai_client_module):
+    mock_openai_client_module.reset_mock(return_value=True, side_effect=True)
+    return mock_openai_client_module
+
+
 @pytest.fixture
 def mock_mongo_client():
     with patch("decision_data.backend.transcribe.whisper.MongoDBClient") as mock:
@@ -33,12 +39,6 @@ def mock_s3_functions():
         yield mock_download, mock_upload, mock_remove, mock_list
 
 
-@pytest.fixture
-def mock_time_sleep():
-    with patch("time.sleep") as mock:
-        yield mock
-
-
 def test_get_utc_datetime():
     # Act
     utc_datetime = get_utc_datetime()
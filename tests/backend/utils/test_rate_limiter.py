@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import patch
+from decision_data.backend.utils.rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def mock_time():
+    with patch("decision_data.backend.utils.rate_limiter.time") as mock:
+        mock.monotonic.return_value = 100.0
+        yield mock
+
+
+def test_acquire_within_capacity_does_not_wait(mock_time):
+    # Arrange
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    # Act
+    bucket.acquire()
+    bucket.acquire()
+
+    # Assert
+    mock_time.sleep.assert_not_called()
+
+
+def test_acquire_waits_for_refill(mock_time):
+    # Arrange
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    # Act
+    bucket.acquire()
+    bucket.acquire()
+
+    # Assert
+    waits = [c.args[0] for c in mock_time.sleep.call_args_list]
+    assert waits == pytest.approx([0.1, 0.2])
+
+
+def test_acquire_refills_over_time(mock_time):
+    # Arrange
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.acquire(2)
+
+    # Act
+    mock_time.monotonic.return_value = 100.5
+    bucket.acquire(2)
+
+    # Assert
+    mock_time.sleep.assert_not_called()
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
@@ -0,0 +1,10 @@
+import time
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_sleep():
+    """Make time.sleep a no-op so polling loops run at full speed in tests."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(time, "sleep", lambda *args, **kwargs: None)
+        yield
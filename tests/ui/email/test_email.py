@@ -1,10 +1,31 @@
 import pytest
 import smtplib
-from unittest.mock import patch
-from decision_data.ui.email.email import format_message, send_email
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from decision_data.ui.email.email import (
+    EmailDispatcher,
+    _build_message,
+    PipeliningSMTP,
+    SMTPPool,
+    close_pool,
+    get_smtp_pool,
+    format_message,
+    send_bulk_email,
+    send_email,
+    send_emails,
+)
 from decision_data.data_structure.models import DailySummary
 
 
+@pytest.fixture(autouse=True)
+def clear_smtp_pools():
+    close_pool()
+    yield
+    close_pool()
+
+
 def test_format_message():
     llm_response = DailySummary(
         family_info=["Family event 1", "Family event 2"],
@@ -13,29 +34,63 @@ def test_format_message():
     )
     date = "2022-01-01"
 
-    expected_message = """
-    <h2>2022-01-01</h2>
-    <h2>Family</h2>
-    <ul>
-        <li>Family event 1</li><li>Family event 2</li>
-    </ul>
+    expected_message = (
+        "<h2>2022-01-01</h2>\n"
+        "<h2>Family</h2>\n<ul>\n"
+        "<li>Family event 1</li>\n<li>Family event 2</li>\n"
+        "</ul>\n"
+        "<h2>Business</h2>\n<ul>\n"
+        "<li>Business meeting 1</li>\n<li>Business meeting 2</li>\n"
+        "</ul>\n"
+        "<h2>Misc</h2>\n<ul>\n"
+        "<li>Misc info 1</li>\n<li>Misc info 2</li>\n"
+        "</ul>\n"
+    )
 
-    <h2>Business</h2>
-    <ul>
-        <li>Business meeting 1</li><li>Business meeting 2</li>
-    </ul>
+    formatted_message = format_message(llm_response, date)
+    assert formatted_message == expected_message
 
-    <h2>Misc</h2>
-    <ul>
-        <li>Misc info 1</li><li>Misc info 2</li>
-    </ul>
-    """
 
-    formatted_message = format_message(llm_response, date)
-    assert formatted_message.strip() == expected_message.strip()
+def test_format_message_cached():
+    llm_response = DailySummary(
+        family_info=["Family event"], business_info=[], misc_info=[]
+    )
+
+    first = format_message(llm_response, "2022-01-01")
+    second = format_message(llm_response.model_copy(), "2022-01-01")
+    other_day = format_message(llm_response, "2022-01-02")
+
+    assert first is second
+    assert other_day != first
+
+
+def test_format_message_escapes_html():
+    llm_response = DailySummary(
+        family_info=["Pick up <kids> & groceries"],
+        business_info=[],
+        misc_info=[],
+    )
+
+    formatted_message = format_message(llm_response, "2022-01-01")
 
+    assert "<li>Pick up &lt;kids&gt; &amp; groceries</li>" in formatted_message
+    assert "<ul>\n</ul>" in formatted_message
 
-@patch("smtplib.SMTP")
+
+def test_format_message_linear():
+    # Regression guard against quadratic string building, not a benchmark.
+    items = [f"Item {i}" for i in range(1000)]
+    llm_response = DailySummary(family_info=items, business_info=items, misc_info=items)
+
+    start = time.perf_counter()
+    formatted_message = format_message(llm_response, "2022-01-01")
+    elapsed = time.perf_counter() - start
+
+    assert formatted_message.count("<li>") == 3000
+    assert elapsed < 1.0
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
 def test_send_email_failure(mock_smtp):
     mock_smtp.side_effect = smtplib.SMTPException("Failed to send email")
 
@@ -51,5 +106,304 @@ def test_send_email_failure(mock_smtp):
         )
 
 
+def test_build_message():
+    msg = _build_message("me@example.com", "you@example.com", "Résumé", "<p>é</p>\n")
+
+    headers, body = msg.split(b"\r\n\r\n", 1)
+    assert b"To: you@example.com" in headers
+    assert b"Subject: =?utf-8?b?UsOpc3Vtw6k=?=" in headers
+    assert b"Content-Type: text/html; charset=utf-8" in headers
+    assert body == "<p>é</p>\r\n".encode("utf-8")
+
+
+def test_build_message_normalises_only_cr_and_lf():
+    msg = _build_message(
+        "me@example.com", "you@example.com", "S", "a\nb\rc\r\nd\u2028e\x0bf"
+    )
+
+    body = msg.split(b"\r\n\r\n", 1)[1]
+    assert body == "a\r\nb\r\nc\r\nd\u2028e\x0bf".encode("utf-8")
+
+
+def test_build_message_long_line_falls_back_to_base64():
+    msg = _build_message("me@example.com", "you@example.com", "Subject", "x" * 2000)
+
+    assert b"Content-Transfer-Encoding: base64" in msg
+    assert b"\n" not in msg.replace(b"\r\n", b"")
+    assert max(len(line) for line in msg.split(b"\r\n")) <= 998
+
+
+def test_build_message_rejects_header_injection():
+    with pytest.raises(ValueError):
+        _build_message("me@example.com", "you@example.com\r\nBcc: x@y.z", "S", "B")
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_send_email_reuses_connection(mock_smtp):
+    mock_server = mock_smtp.return_value
+
+    for _ in range(3):
+        send_email(
+            recipient_email="test@example.com",
+            subject="Test Subject",
+            message_body="This is a test email body.",
+        )
+
+    mock_smtp.assert_called_once()
+    mock_server.starttls.assert_called_once()
+    mock_server.login.assert_called_once()
+    assert mock_server.sendmail.call_count == 3
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_close_pool_logs_out_idle_connections(mock_smtp):
+    send_email("test@example.com", "Subject", "Body")
+
+    close_pool()
+    mock_smtp.return_value.quit.assert_called_once()
+
+    send_email("test@example.com", "Subject", "Body")
+    assert mock_smtp.call_count == 2
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_send_email_retries_dropped_connection(mock_smtp):
+    stale_server = mock_smtp.return_value
+    send_email("test@example.com", "Subject", "Body")
+
+    fresh_server = mock_smtp.return_value = type(stale_server)()
+    stale_server.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+
+    assert send_email("test@example.com", "Subject", "Body") == (
+        "Message sent successfully"
+    )
+    fresh_server.sendmail.assert_called_once()
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_smtp_pool_retires_used_up_connection(mock_smtp):
+    pool = SMTPPool(
+        "smtp.example.com", 587, "user", "password", max_messages_per_conn=2
+    )
+
+    for _ in range(3):
+        with pool.connection() as server:
+            server.sendmail("user", "to@example.com", "msg")
+
+    assert mock_smtp.call_count == 2
+    mock_smtp.return_value.quit.assert_called_once()
+
+
+@patch("decision_data.ui.email.email.SMTPPool")
+def test_get_smtp_pool_shared_across_threads(mock_pool):
+    # A slow constructor widens the window in which first senders race
+    def slow_pool(**kwargs):
+        threading.Event().wait(0.05)
+        return MagicMock()
+
+    mock_pool.side_effect = slow_pool
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        pools = list(
+            executor.map(
+                lambda _: get_smtp_pool("smtp.example.com", 587, "user", "pw"),
+                range(10),
+            )
+        )
+
+    mock_pool.assert_called_once()
+    assert all(pool is pools[0] for pool in pools)
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_smtp_pool_releases_slot_on_base_exception(mock_smtp):
+    pool = SMTPPool("smtp.example.com", 587, "user", "password", max_conns=1)
+
+    with pytest.raises(KeyboardInterrupt):
+        with pool.connection():
+            raise KeyboardInterrupt
+
+    mock_smtp.return_value.close.assert_called_once()
+    # The only slot was given back, so this does not block.
+    with pool.connection() as server:
+        server.sendmail("user", "to@example.com", "msg")
+    assert mock_smtp.call_count == 2
+
+
+@patch("decision_data.ui.email.email.PipeliningSMTP")
+def test_send_bulk_email_batches_recipients(mock_smtp):
+    mock_server = mock_smtp.return_value
+    recipients = [f"user{i}@example.com" for i in range(120)]
+
+    send_bulk_email(recipients, "Subject", "Body", batch_size=50)
+
+    batches = [c.args[1] for c in mock_server.sendmail.call_args_list]
+    assert [len(batch) for batch in batches] == [50, 50, 20]
+    assert sum(batches, []) == recipients
+    msg = mock_server.sendmail.call_args.args[2]
+    assert b"To: undisclosed-recipients:;" in msg
+    assert b"user0@example.com" not in msg
+
+
+def _pipelining_server(replies):
+    server = PipeliningSMTP()
+    server.ehlo_resp = b"smtp.example.com"
+    server.does_esmtp = True
+    server.esmtp_features = {"pipelining": ""}
+    server.send = MagicMock()
+    server.getreply = MagicMock(side_effect=replies)
+    return server
+
+
+def test_pipelining_smtp_sends_envelope_in_one_write():
+    server = _pipelining_server(
+        [(250, b"ok"), (250, b"ok"), (250, b"ok"), (354, b"go"), (250, b"queued")]
+    )
+
+    refused = server.sendmail(
+        "me@example.com", ["a@example.com", "b@example.com"], "Hi\n.dot\n"
+    )
+
+    assert refused == {}
+    envelope, *body = [c.args[0] for c in server.send.call_args_list]
+    assert envelope == (
+        "mail FROM:<me@example.com>\r\n"
+        "rcpt TO:<a@example.com>\r\n"
+        "rcpt TO:<b@example.com>\r\n"
+        "data\r\n"
+    )
+    assert b"".join(body) == b"Hi\r\n..dot\r\n.\r\n"
+
+
+def test_pipelining_smtp_streams_large_body_in_chunks():
+    server = _pipelining_server(
+        [(250, b"ok"), (250, b"ok"), (354, b"go"), (250, b"ok")]
+    )
+    msg = b"x" * 40000
+
+    server.sendmail("me@example.com", "a@example.com", msg)
+
+    _, *body = [c.args[0] for c in server.send.call_args_list]
+    assert [len(chunk) for chunk in body] == [16384, 16384, 7232, 5]
+    assert b"".join(body) == msg + b"\r\n.\r\n"
+
+
+def test_pipelining_smtp_all_recipients_refused():
+    server = _pipelining_server([(250, b"ok"), (550, b"no such user"), (554, b"no")])
+    server.rset = MagicMock()
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        server.sendmail("me@example.com", "a@example.com", "Hi")
+
+    server.rset.assert_called_once()
+
+
+@patch("decision_data.ui.email.email.send_email")
+def test_send_emails(mock_send_email):
+    mock_send_email.return_value = "Message sent successfully"
+    messages = [
+        ("a@example.com", "Subject A", "Body A"),
+        ("b@example.com", "Subject B", "Body B"),
+        ("c@example.com", "Subject C", "Body C"),
+    ]
+
+    results = send_emails(messages)
+
+    assert results == ["Message sent successfully"] * len(messages)
+    assert mock_send_email.call_count == len(messages)
+    mock_send_email.assert_any_call(
+        recipient_email="b@example.com",
+        subject="Subject B",
+        message_body="Body B",
+    )
+
+
+def test_send_emails_empty():
+    assert send_emails([]) == []
+
+
+@patch("decision_data.ui.email.email.send_bulk_email")
+@patch("decision_data.ui.email.email.send_email")
+def test_email_dispatcher_batches_identical_messages(
+    mock_send_email, mock_send_bulk_email
+):
+    mock_send_email.return_value = "single"
+    mock_send_bulk_email.return_value = "bulk"
+    dispatcher = EmailDispatcher(batch_max=3, batch_wait=5.0)
+
+    futures = [
+        dispatcher.submit("a@example.com", "Summary", "Body"),
+        dispatcher.submit("b@example.com", "Summary", "Body"),
+        dispatcher.submit("c@example.com", "Other", "Body"),
+    ]
+    dispatcher.close()
+
+    assert [future.result() for future in futures] == ["bulk", "bulk", "single"]
+    mock_send_bulk_email.assert_called_once_with(
+        ["a@example.com", "b@example.com"], "Summary", "Body"
+    )
+    mock_send_email.assert_called_once_with("c@example.com", "Other", "Body")
+
+
+@patch("decision_data.ui.email.email.send_email")
+def test_email_dispatcher_propagates_errors(mock_send_email):
+    mock_send_email.side_effect = smtplib.SMTPException("Failed to send email")
+    dispatcher = EmailDispatcher()
+
+    future = dispatcher.submit("a@example.com", "Summary", "Body")
+    dispatcher.close()
+
+    with pytest.raises(smtplib.SMTPException, match="Failed to send email"):
+        future.result()
+
+
+@patch("decision_data.ui.email.email.send_bulk_email")
+@patch("decision_data.ui.email.email.send_email")
+def test_email_dispatcher_skips_cancelled_emails(mock_send_email, mock_send_bulk_email):
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_send(*args):
+        started.set()
+        release.wait(timeout=5)
+        return "single"
+
+    mock_send_email.side_effect = blocking_send
+    mock_send_bulk_email.return_value = "bulk"
+    dispatcher = EmailDispatcher(batch_max=3, batch_wait=0.1)
+
+    # Keep the worker busy so the next emails wait in the queue together
+    first = dispatcher.submit("first@example.com", "Busy", "Body")
+    assert started.wait(timeout=5)
+    futures = [
+        dispatcher.submit(f"{name}@example.com", "Summary", "Body")
+        for name in ("a", "b", "c")
+    ]
+    assert futures[0].cancel()
+    release.set()
+
+    assert first.result(timeout=5) == "single"
+    assert [future.result(timeout=5) for future in futures[1:]] == ["bulk", "bulk"]
+    mock_send_bulk_email.assert_called_once_with(
+        ["b@example.com", "c@example.com"], "Summary", "Body"
+    )
+
+    # The worker survived the cancellation and keeps sending
+    later = dispatcher.submit("d@example.com", "Later", "Body")
+    assert later.result(timeout=5) == "single"
+    dispatcher.close()
+
+
+@patch("decision_data.ui.email.email.send_email")
+def test_email_dispatcher_rejects_submit_after_close(mock_send_email):
+    dispatcher = EmailDispatcher()
+    dispatcher.close()
+
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("a@example.com", "Summary", "Body")
+
+    dispatcher.close()
+    mock_send_email.assert_not_called()
+
+
 if __name__ == "__main__":
     pytest.main()
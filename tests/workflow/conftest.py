@@ -0,0 +1,83 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, patch
+from decision_data.backend.workflow.daily_summary import (
+    _mongo_client,
+    _openai_client,
+)
+from decision_data.data_structure.models import DailySummary
+
+
+@pytest.fixture(scope="session")
+def daily_prompt(tmp_path_factory):
+    """Write the daily summary prompt once and share it across tests."""
+    prompt_path = tmp_path_factory.mktemp("prompts") / "daily_summary.txt"
+    prompt_path.write_text("Daily summary prompt.")
+    return prompt_path
+
+
+@pytest.fixture(scope="session")
+def make_completion():
+    """Build a structured-output chat completion from plain namespaces.
+
+    Only the client needs MagicMock's call recording; the returned value
+    graph does not, and SimpleNamespace is much cheaper to construct.
+    """
+
+    def _make_completion(summary):
+        message = SimpleNamespace(content=summary.model_dump_json())
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    return _make_completion
+
+
+@pytest.fixture(scope="session")
+def daily_summary():
+    return DailySummary(
+        family_info=["Pick up the kids at 5pm"],
+        business_info=[],
+        misc_info=[],
+    )
+
+
+@pytest.fixture(scope="module")
+def workflow_mocks():
+    # Patch every external dependency of the workflow in one call per module
+    # and only clear recorded calls between tests.
+    with patch.multiple(
+        "decision_data.backend.workflow.daily_summary",
+        MongoDBClient=DEFAULT,
+        OpenAI=DEFAULT,
+        send_email=DEFAULT,
+        format_message=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture
+def reset_workflow_mocks(workflow_mocks):
+    for mock in workflow_mocks.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    # The cached clients would otherwise outlive the reset mocks
+    _mongo_client.cache_clear()
+    _openai_client.cache_clear()
+    return workflow_mocks
+
+
+@pytest.fixture
+def mock_mongo_client(reset_workflow_mocks):
+    return reset_workflow_mocks["MongoDBClient"]
+
+
+@pytest.fixture
+def mock_openai_client(reset_workflow_mocks, make_completion, daily_summary):
+    mock = reset_workflow_mocks["OpenAI"]
+    mock.return_value.chat.completions.create.return_value = make_completion(
+        daily_summary
+    )
+    return mock
+
+
+@pytest.fixture
+def mock_email_functions(reset_workflow_mocks):
+    return reset_workflow_mocks["send_email"], reset_workflow_mocks["format_message"]
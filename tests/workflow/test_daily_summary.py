@@ -1,60 +1,367 @@
+import json
 import pytest
-from unittest.mock import patch
+import threading
 from pathlib import Path
-from decision_data.backend.workflow.daily_summary import generate_summary
-import tempfile
+from decision_data.backend.workflow.daily_summary import (
+    _DAILY_SUMMARY_RESPONSE_FORMAT,
+    _read_prompt,
+    _summary_cache,
+    generate_summary,
+    generate_summaries_batch,
+    get_daily_transcripts,
+)
 
+PROMPT = "Daily summary prompt."
 
-@pytest.fixture
-def mock_mongo_client():
-    with patch("decision_data.backend.workflow.daily_summary.MongoDBClient") as mock:
-        yield mock
 
-
-@pytest.fixture
-def mock_openai_client():
-    with patch("decision_data.backend.workflow.daily_summary.OpenAI") as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_email_functions():
-    with patch(
-        "decision_data.backend.workflow.daily_summary.send_email"
-    ) as mock_send_email, patch(
-        "decision_data.backend.workflow.daily_summary.format_message"
-    ) as mock_format_message:
-        yield mock_send_email, mock_format_message
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    _summary_cache.clear()
+    yield
+    _summary_cache.clear()
 
 
 def test_generate_summary(
-    mocker,
+    daily_prompt,
+    daily_summary,
     mock_mongo_client,
     mock_openai_client,
     mock_email_functions,
 ):
     # Arrange
     mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.return_value = [
+        {
+            "transcript": "Pick up the kids at 5pm.",
+            "length_in_seconds": 10.0,
+            "original_audio_path": "s3://bucket/audio.wav",
+            "created_utc": "2024-12-11T20:00:00Z",
+        }
+    ]
     mock_openai_instance = mock_openai_client.return_value
 
-    with tempfile.NamedTemporaryFile(delete=False) as temp_prompt_file:
-        temp_prompt_file.write(b"Daily summary prompt: {daily_transcript}")
-        temp_prompt_file_path = Path(temp_prompt_file.name)
-
     # Act
     generate_summary(
         year="2024",
         month="12",
         day="11",
-        prompt_path=temp_prompt_file_path,
+        prompt=daily_prompt,
     )
 
     # Assert
-    mock_mongo_instance.get_records_between_dates.assert_called_once()
-    mock_openai_instance.beta.chat.completions.parse.assert_called_once()
+    mock_mongo_instance.iter_records_between_dates.assert_called_once()
+    projection = mock_mongo_instance.iter_records_between_dates.call_args.kwargs[
+        "projection"
+    ]
+    assert projection == {
+        "_id": 0,
+        "transcript": 1,
+        "length_in_seconds": 1,
+        "original_audio_path": 1,
+        "created_utc": 1,
+    }
+    mock_openai_instance.chat.completions.create.assert_called_once()
     mock_email_functions[0].assert_called_once()
-    mock_email_functions[1].assert_called_once()
+    mock_email_functions[1].assert_called_once_with(
+        llm_response=daily_summary, date="2024-12-11"
+    )
     mock_mongo_instance.insert_daily_summary.assert_called_once()
 
-    # Clean up
-    temp_prompt_file_path.unlink()
+
+def test_generate_summary_no_transcripts(
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    mock_mongo_client.return_value.iter_records_between_dates.return_value = []
+
+    # Act
+    generate_summary(year="2024", month="12", day="11", prompt=PROMPT)
+
+    # Assert
+    mock_openai_client.assert_not_called()
+    mock_email_functions[0].assert_not_called()
+    mock_mongo_client.return_value.insert_daily_summary.assert_not_called()
+
+
+def test_generate_summaries_batch(
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.return_value = [
+        {
+            "transcript": "Pick up the kids at 5pm.",
+            "length_in_seconds": 10.0,
+            "original_audio_path": "s3://bucket/audio.wav",
+            "created_utc": "2024-12-11T20:00:00Z",
+        }
+    ]
+    mock_openai_instance = mock_openai_client.return_value
+    mock_batch = mock_openai_instance.batches.create.return_value
+    mock_batch.status = "completed"
+    summary = {"family_info": ["Pick up kids"], "business_info": [], "misc_info": []}
+    mock_openai_instance.files.content.return_value.text = "\n".join(
+        json.dumps(
+            {
+                "custom_id": f"2024-12-{day}",
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"content": json.dumps(summary)}}]
+                    },
+                },
+                "error": None,
+            }
+        )
+        for day in ("11", "12")
+    )
+
+    # Act
+    generate_summaries_batch(
+        dates=[("2024", "12", "11"), ("2024", "12", "12")],
+        prompt=PROMPT,
+    )
+
+    # Assert
+    mock_openai_instance.files.create.assert_called_once()
+    mock_openai_instance.batches.create.assert_called_once()
+    mock_openai_instance.chat.completions.create.assert_not_called()
+    batch_file = mock_openai_instance.files.create.call_args.kwargs["file"][1]
+    assert len(batch_file.splitlines()) == 2
+    assert mock_email_functions[0].call_count == 2
+    mock_mongo_instance.insert_daily_summary.assert_not_called()
+    mock_mongo_instance.insert_daily_summaries.assert_called_once()
+    records = mock_mongo_instance.insert_daily_summaries.call_args.args[0]
+    assert [record["created_utc"] for record in records] == [
+        "2024-12-11",
+        "2024-12-12",
+    ]
+
+
+def test_prompt_prefix_cached(
+    mocker,
+    daily_prompt,
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.side_effect = [
+        [
+            {
+                "transcript": transcript,
+                "length_in_seconds": 10.0,
+                "original_audio_path": "s3://bucket/audio.wav",
+                "created_utc": "2024-12-11T20:00:00Z",
+            }
+        ]
+        for transcript in ("Pick up the kids at 5pm.", "Dentist on Friday.")
+    ]
+    mock_create = mock_openai_client.return_value.chat.completions.create
+    _read_prompt.cache_clear()
+    read_text = mocker.spy(Path, "read_text")
+
+    # Act
+    for day in ("11", "12"):
+        generate_summary(year="2024", month="12", day=day, prompt=daily_prompt)
+
+    # Assert
+    first, second = (call.kwargs["messages"] for call in mock_create.call_args_list)
+    assert (
+        first[0]
+        == second[0]
+        == {
+            "role": "system",
+            "content": "Daily summary prompt.",
+        }
+    )
+    assert "Pick up the kids" in first[1]["content"]
+    assert "Dentist on Friday" in second[1]["content"]
+    read_text.assert_called_once()
+
+
+def test_generate_summary_with_transcripts(
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    transcripts = ["Pick up the kids at 5pm.", "Standup at 9am.", "Nice weather."]
+    mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.return_value = [
+        {
+            "transcript": transcript,
+            "length_in_seconds": 10.0,
+            "original_audio_path": "s3://bucket/audio.wav",
+            "created_utc": "2024-12-11T20:00:00Z",
+        }
+        for transcript in transcripts
+    ]
+    mock_create = mock_openai_client.return_value.chat.completions.create
+
+    # Act
+    generate_summary(year="2024", month="12", day="11", prompt=PROMPT)
+
+    # Assert
+    mock_create.assert_called_once()
+    call_kwargs = mock_create.call_args.kwargs
+    assert call_kwargs["response_format"] is _DAILY_SUMMARY_RESPONSE_FORMAT
+    user_content = call_kwargs["messages"][1]["content"]
+    expected = json.dumps([{"id": i, "text": t} for i, t in enumerate(transcripts)])
+    assert expected in user_content
+
+
+def test_generate_summary_cache_hit(
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.return_value = [
+        {
+            "transcript": "Pick up the kids at 5pm.",
+            "length_in_seconds": 10.0,
+            "original_audio_path": "s3://bucket/audio.wav",
+            "created_utc": "2024-12-11T20:00:00Z",
+        }
+    ]
+    mock_create = mock_openai_client.return_value.chat.completions.create
+
+    # Act
+    for _ in range(2):
+        generate_summary(year="2024", month="12", day="11", prompt=PROMPT)
+
+    # Assert
+    assert mock_create.call_count == 1
+    assert mock_email_functions[0].call_count == 2
+
+
+def test_generate_summary_multipage(
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    pages = [
+        [
+            {
+                "transcript": f"page {page} record {record}",
+                "length_in_seconds": 10.0,
+                "original_audio_path": "s3://bucket/audio.wav",
+                "created_utc": "2024-12-11T20:00:00Z",
+            }
+            for record in range(100)
+        ]
+        for page in range(3)
+    ]
+    mock_mongo_instance = mock_mongo_client.return_value
+    mock_mongo_instance.iter_records_between_dates.return_value = (
+        record for page in pages for record in page
+    )
+    mock_create = mock_openai_client.return_value.chat.completions.create
+
+    # Act
+    generate_summary(year="2024", month="12", day="11", prompt=PROMPT)
+
+    # Assert
+    mock_create.assert_called_once()
+    user_content = mock_create.call_args.kwargs["messages"][1]["content"]
+    transcripts = json.loads(user_content.split("\n")[1])
+    assert len(transcripts) == 300
+    assert transcripts[0]["text"] == "page 0 record 0"
+    assert transcripts[-1] == {"id": 299, "text": "page 2 record 99"}
+
+
+@pytest.mark.parametrize(
+    "offset, start, end",
+    [
+        (-6, "2024-12-11T06:00:00Z", "2024-12-12T06:00:00Z"),
+        (0, "2024-12-11T00:00:00Z", "2024-12-12T00:00:00Z"),
+        (9, "2024-12-10T15:00:00Z", "2024-12-11T15:00:00Z"),
+    ],
+)
+def test_get_daily_transcripts_utc_window(
+    mocker, mock_mongo_client, offset, start, end
+):
+    mocker.patch(
+        "decision_data.backend.workflow.daily_summary.backend_config."
+        "TIME_OFFSET_FROM_UTC",
+        offset,
+    )
+    mock_mongo_instance = mock_mongo_client.return_value
+
+    get_daily_transcripts(year="2024", month="12", day="11")
+
+    call_kwargs = mock_mongo_instance.iter_records_between_dates.call_args.kwargs
+    assert call_kwargs["start_date_str"] == start
+    assert call_kwargs["end_date_str"] == end
+
+
+def test_generate_summary_reuses_clients(
+    mocker,
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    config = "decision_data.backend.workflow.daily_summary.backend_config"
+    mocker.patch(f"{config}.MONGODB_TRANSCRIPTS_COLLECTION_NAME", "transcripts")
+    mocker.patch(f"{config}.MONGODB_DAILY_SUMMARY_COLLECTION_NAME", "summaries")
+    mock_mongo_client.return_value.iter_records_between_dates.side_effect = (
+        lambda **_: [
+            {
+                "transcript": "Pick up the kids at 5pm.",
+                "length_in_seconds": 10.0,
+                "original_audio_path": "s3://bucket/audio.wav",
+                "created_utc": "2024-12-11T20:00:00Z",
+            }
+        ]
+    )
+
+    # Act
+    for day in ("11", "12", "13"):
+        generate_summary(year="2024", month="12", day=day, prompt=PROMPT)
+
+    # Assert
+    # One client per collection (transcripts and summaries), not per call
+    assert mock_mongo_client.call_count == 2
+    mock_openai_client.assert_called_once()
+    mock_mongo_client.return_value.close.assert_not_called()
+    mock_mongo_client.return_value.ensure_indexes.assert_called_once()
+
+
+def test_generate_summaries_batch_builds_mongo_client_once(
+    mocker,
+    mock_mongo_client,
+    mock_openai_client,
+    mock_email_functions,
+):
+    # Arrange
+    config = "decision_data.backend.workflow.daily_summary.backend_config"
+    mocker.patch(f"{config}.MONGODB_TRANSCRIPTS_COLLECTION_NAME", "transcripts")
+    mock_instance = mock_mongo_client.return_value
+    mock_instance.iter_records_between_dates.side_effect = lambda **_: []
+
+    # A slow constructor widens the window in which worker threads race
+    def slow_client(**kwargs):
+        threading.Event().wait(0.05)
+        return mock_instance
+
+    mock_mongo_client.side_effect = slow_client
+
+    # Act
+    generate_summaries_batch(
+        dates=[("2024", "12", f"{day:02d}") for day in range(1, 11)],
+        prompt=PROMPT,
+    )
+
+    # Assert
+    mock_mongo_client.assert_called_once()
+    assert mock_instance.iter_records_between_dates.call_count == 10
+    mock_openai_client.assert_not_called()